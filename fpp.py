@@ -1,15 +1,104 @@
-import subprocess, shlex, sys, platform, os, csv, threading, contextlib, queue
+import subprocess, shlex, sys, platform, os, csv, threading, contextlib, queue, sqlite3, time, heapq, collections, hashlib, mimetypes, mmap, re, functools, signal, multiprocessing, shutil
 from urllib.parse import urlparse
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from PyQt5.QtWidgets import (QApplication, QWidget, QListWidget, QVBoxLayout, QPushButton,
                              QShortcut, QHBoxLayout, QFileDialog, QMessageBox, QListWidgetItem,
-                             QInputDialog, QLabel)
-from PyQt5.QtCore import Qt, QMimeData, QUrl, QEvent, QItemSelectionModel
-from PyQt5.QtGui import QDrag, QKeySequence, QFont
+                             QInputDialog, QLabel, QStyledItemDelegate, QStyle, QStyleOptionViewItem, QProgressDialog,
+                             QTabBar, QListView)
+from PyQt5.QtCore import (Qt, QMimeData, QUrl, QEvent, QItemSelectionModel, QFileSystemWatcher, QTimer,
+                          QAbstractListModel, QModelIndex)
+from PyQt5.QtGui import QDrag, QKeySequence, QFont, QColor
 
 # Define filenames for the current list and font size
 CURRENT_LIST_FILENAME = "current_list.csv"
 FONT_SIZE_FILENAME = "font_size.csv"
+RUN_ALL_WORKERS_FILENAME = "run_all_workers.csv"
+RESOURCE_LIMITS_FILENAME = "resource_limits.csv"
+RUN_HISTORY_FILENAME = "run_history.db"
+WORKSPACES_FILENAME = "workspaces.csv"
+MEMORY_BUDGET_FILENAME = "memory_budget.csv"
+
+# Named lists: the first one keeps using current_list.csv, the others live in FilePP/lists
+DEFAULT_WORKSPACE_NAME = "current"
+WORKSPACE_FOLDER = "lists"
+DEFAULT_MEMORY_BUDGET_MB = 256
+
+# Number of past durations per command used for runtime estimates
+RUN_HISTORY_DEPTH = 5
+
+# Export filters, and where exported Makefiles / Ninja files keep the stamp file of each finished row
+CSV_FILTER = "CSV Files (*.csv)"
+MAKEFILE_FILTER = "Makefile (Makefile *.mk)"
+NINJA_FILTER = "Ninja Files (*.ninja)"
+STAMP_DIRECTORY = ".fpp-stamps"
+
+# Opening files: how many openers may run at once, the minimum gap between two launches,
+# and how long an opener may block before it is treated as launched
+OPEN_CONCURRENCY = 4
+OPEN_INTERVAL_SECONDS = 0.05
+OPEN_SETTLE_SECONDS = 5
+
+# Metadata column: cached entries, rows fetched beyond the viewport, and background stat workers
+METADATA_CACHE_SIZE = 10000
+METADATA_PREFETCH_ROWS = 50
+METADATA_WORKERS = 4
+
+# Sort choices offered for the file list: label -> (metadata field or None for the path, descending)
+SORT_CHOICES = {
+    "Path (A to Z)": (None, False),
+    "Size (largest first)": ("size", True),
+    "Size (smallest first)": ("size", False),
+    "Modified (newest first)": ("mtime", True),
+    "Modified (oldest first)": ("mtime", False),
+    "Type (A to Z)": ("mimeType", False),
+}
+
+FileMetadata = collections.namedtuple("FileMetadata", ["size", "mtime", "mimeType"])
+
+# Duplicate detection: bytes hashed from each end of a file before committing to a full hash,
+# and the background colors alternated between duplicate groups
+DUPLICATE_PARTIAL_BYTES = 64 * 1024
+DUPLICATE_COLORS = ["#F9E79F", "#F5CBA7", "#D7BDE2", "#A9DFBF", "#AED6F1"]
+
+# Content search: bytes sniffed for a NUL to skip binaries, size of each mapped chunk searched,
+# overlap between chunks so matches across a boundary are found, and files searched at once
+SEARCH_SNIFF_BYTES = 8192
+SEARCH_CHUNK_BYTES = 4 * 1024 * 1024
+SEARCH_OVERLAP_BYTES = 64 * 1024
+SEARCH_WORKERS = 8
+
+# Resource limits and run options, globally or per row as "@nice=10 @cpus=0-3 @mem=2G @timeout=10m @retries=2"
+# after ':}' in the right list
+RESOURCE_LIMIT_PATTERN = re.compile(r'(@?)\b(nice|cpus|mem|timeout|retries)=(\S+)')
+MEMORY_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+TIME_UNITS = {'': 1, 's': 1, 'm': 60, 'h': 3600}
+
+# Scheduler: threads taking jobs off the command queue, the retry backoff, and how long a
+# terminated process group gets before it is killed
+SCHEDULER_THREADS = os.cpu_count() or 1
+RETRY_BASE_DELAY_SECONDS = 2
+RETRY_MAX_DELAY_SECONDS = 60
+KILL_GRACE_SECONDS = 5
+
+# Governor: how often a held-back job re-checks the system, and how much memory must stay available
+GOVERNOR_POLL_SECONDS = 1.0
+GOVERNOR_MEMORY_RESERVE = 0.1  # Fraction of MemTotal
+
+# Placeholders a command template may use for parts of the row's path; {{name}} stands for a literal {name}
+# and shell ${name} is left alone. Only rows with @template in their comment are templates.
+TEMPLATE_FIELD_PATTERN = re.compile(r'\{\{(path|dir|name|stem|ext)\}\}|(?<!\$)\{(path|dir|name|stem|ext)\}')
+TEMPLATE_DIRECTIVE_PATTERN = re.compile(r'@template\b')
+
+# Watch mode: item data role holding a watched row's token, and how long to wait for a burst of saves to settle
+WATCH_ROLE = Qt.UserRole + 1
+WATCH_DEBOUNCE_MS = 300
+
+# Item data roles behind a row's background: the reason a command failed, and the color of its duplicate group
+FAILURE_ROLE = Qt.UserRole + 2
+DUPLICATE_ROLE = Qt.UserRole + 3
+FAILURE_COLOR = "#F5B7B1"
+# Everything a file row may carry besides its text; the display roles follow from the first three
+ROW_DATA_ROLES = (WATCH_ROLE, FAILURE_ROLE, DUPLICATE_ROLE, Qt.ForegroundRole, Qt.BackgroundRole, Qt.ToolTipRole)
 
 # Context manager for subprocess management
 @contextlib.contextmanager
@@ -23,6 +112,574 @@ def managed_subprocess(*args, **kwargs):
             process.wait()
 
 
+# A named list shown as a tab; rows are only held in memory while the tab is loaded but inactive
+class Workspace:
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self.rows = None  # None while unloaded, or while active (the list widgets hold the rows then)
+        self.size = 0  # Approximate memory held by rows, in bytes
+
+    def store(self, rows):
+        self.rows = rows
+        self.size = sum(sys.getsizeof(row) + sum(sys.getsizeof(text) for text in row) for row in rows)
+
+    def readRows(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, 'r', newline='', encoding='utf-8') as file:
+            reader = csv.reader(file)
+            next(reader, None)  # Skip headers
+            return [tuple(row) for row in reader if len(row) == 3]
+
+    def save(self):
+        with open(self.path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(["LeftItem", "FilePath", "RightItem"])  # Write headers
+            writer.writerows(self.rows)
+
+    def evict(self):
+        self.save()
+        self.rows = None
+        self.size = 0
+
+
+# Past durations of each constructed command, kept in a small SQLite database
+class RunHistory:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        with self.connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS runs (command TEXT NOT NULL, duration REAL NOT NULL, finished_at REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS runs_command ON runs (command, finished_at)")
+
+    @contextlib.contextmanager
+    def connect(self):
+        # A short-lived connection per call, since commands finish on worker threads
+        with self.lock, contextlib.closing(sqlite3.connect(self.path)) as conn, conn:
+            yield conn
+
+    def record(self, command, duration):
+        with self.connect() as conn:
+            conn.execute("INSERT INTO runs (command, duration, finished_at) VALUES (?, ?, ?)", (command, duration, time.time()))
+            # Only the most recent runs matter for estimates
+            conn.execute("""DELETE FROM runs WHERE command = ? AND rowid NOT IN
+                            (SELECT rowid FROM runs WHERE command = ? ORDER BY finished_at DESC LIMIT ?)""",
+                         (command, command, RUN_HISTORY_DEPTH))
+
+    def estimates(self, commands):
+        # Mean of the recent durations for every command that has been run before
+        estimates = {}
+        with self.connect() as conn:
+            for command in set(commands):
+                duration, = conn.execute("SELECT AVG(duration) FROM runs WHERE command = ?", (command,)).fetchone()
+                if duration is not None:
+                    estimates[command] = duration
+        return estimates
+
+
+# Opens files with the platform opener off the GUI thread, a few at a time and rate limited
+class BatchLauncher:
+    def __init__(self, onFinished):
+        self.executor = ThreadPoolExecutor(max_workers=OPEN_CONCURRENCY)
+        self.onFinished = onFinished  # Called from a worker thread with the failures of a batch
+        self.rateLock = threading.Lock()
+        self.nextLaunchTime = 0.0
+
+    def launch(self, paths):
+        futures = [self.executor.submit(self.open, path) for path in paths]
+        def report():
+            failures = [failure for failure in (future.result() for future in futures) if failure]
+            self.onFinished(failures)
+        threading.Thread(target=report, daemon=True).start()
+
+    def waitForTurn(self):
+        with self.rateLock:
+            now = time.monotonic()
+            delay = self.nextLaunchTime - now
+            self.nextLaunchTime = max(now, self.nextLaunchTime) + OPEN_INTERVAL_SECONDS
+        if delay > 0:
+            time.sleep(delay)
+
+    def open(self, path):
+        # Returns a description of the failure, or None if the file was opened
+        self.waitForTurn()
+        try:
+            if platform.system() == 'Windows':
+                os.startfile(path)  # For Windows
+                return None
+            opener = 'open' if platform.system() == 'Darwin' else 'xdg-open'
+            process = subprocess.Popen([opener, path], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            try:
+                _, errors = process.communicate(timeout=OPEN_SETTLE_SECONDS)
+            except subprocess.TimeoutExpired:
+                # Some handlers block until the viewer exits; free the slot and reap it in the background
+                threading.Thread(target=process.communicate, daemon=True).start()
+                return None
+            if process.returncode:
+                return f"{path}: {errors.strip() or f'exit status {process.returncode}'}"
+            return None
+        except Exception as e:
+            return f"{path}: {e}"
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def readMetadata(path):
+    # Returns None for :} items, URLs and paths that no longer exist
+    if path.startswith(':}') or urlparse(path).scheme in ('http', 'https'):
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    mimeType = 'inode/directory' if os.path.isdir(path) else mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    return FileMetadata(stat.st_size, stat.st_mtime, mimeType)
+
+
+def formatSize(size):
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+# Bounded LRU cache of file metadata, filled on demand by background workers
+class FileMetadataCache:
+    MISSING = object()  # Not fetched yet, as opposed to None for paths without metadata
+
+    def __init__(self, onLoaded):
+        self.entries = collections.OrderedDict()
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=METADATA_WORKERS)
+        self.onLoaded = onLoaded  # Called from a worker thread after an entry is stored
+
+    def get(self, path):
+        with self.lock:
+            if path not in self.entries:
+                return self.MISSING
+            self.entries.move_to_end(path)
+            return self.entries[path]
+
+    def request(self, paths):
+        for path in paths:
+            with self.lock:
+                if path in self.entries or path in self.pending:
+                    continue
+                self.pending.add(path)
+            self.executor.submit(self.load, path)
+
+    def load(self, path):
+        self.store(path, readMetadata(path))
+        self.onLoaded()
+
+    def fetch(self, path):
+        # Blocking lookup for callers that are already off the GUI thread
+        metadata = self.get(path)
+        if metadata is self.MISSING:
+            metadata = readMetadata(path)
+            self.store(path, metadata)
+        return metadata
+
+    def store(self, path, metadata):
+        with self.lock:
+            self.entries[path] = metadata
+            self.entries.move_to_end(path)
+            self.pending.discard(path)
+            while len(self.entries) > METADATA_CACHE_SIZE:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, path=None):
+        with self.lock:
+            if path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(path, None)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Draws size, modification time and type at the right of each path; only visible rows are painted,
+# so only visible rows are ever fetched
+class FileMetadataDelegate(QStyledItemDelegate):
+    def __init__(self, cache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.enabled = False
+
+    def paint(self, painter, option, index):
+        metadata = self.cache.get(index.data()) if self.enabled else None
+        if metadata is FileMetadataCache.MISSING:
+            self.cache.request([index.data()])
+        if not metadata or metadata is FileMetadataCache.MISSING:
+            super().paint(painter, option, index)
+            return
+
+        text = f"{formatSize(metadata.size)}   {time.strftime('%Y-%m-%d %H:%M', time.localtime(metadata.mtime))}   {metadata.mimeType}"
+        textWidth = option.fontMetrics.horizontalAdvance(text) + 12
+
+        # Draw the row background across the full width, then the path in what is left of it
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, option.widget)
+        pathOption = QStyleOptionViewItem(option)
+        pathOption.rect = option.rect.adjusted(0, 0, -textWidth, 0)
+        super().paint(painter, pathOption, index)
+
+        painter.save()
+        painter.setPen(QColor("#808080"))
+        painter.drawText(option.rect.adjusted(0, 0, -6, 0), Qt.AlignRight | Qt.AlignVCenter, text)
+        painter.restore()
+
+
+def partialDigest(path, size):
+    # Hash of the head and tail of a file, enough to tell most same-size files apart
+    try:
+        with open(path, 'rb') as file:
+            digest = hashlib.blake2b(file.read(DUPLICATE_PARTIAL_BYTES))
+            if size > DUPLICATE_PARTIAL_BYTES:
+                file.seek(max(DUPLICATE_PARTIAL_BYTES, size - DUPLICATE_PARTIAL_BYTES))
+                digest.update(file.read(DUPLICATE_PARTIAL_BYTES))
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+
+def fullDigest(path):
+    # Runs in a worker process; the file is memory-mapped so it is never read into the heap
+    try:
+        with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.blake2b(mapped).hexdigest()
+    except (OSError, ValueError):
+        return None
+
+
+def findDuplicateGroups(paths, reportProgress, isCancelled):
+    # Narrow the candidates step by step: same size, then same head and tail, then same full hash
+    bySize = collections.defaultdict(list)
+    seenFiles = set()
+    for index, path in enumerate(paths):
+        if isCancelled():
+            return []
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if (stat.st_dev, stat.st_ino) in seenFiles:
+            continue  # The same file listed twice or hard-linked is not a copy
+        seenFiles.add((stat.st_dev, stat.st_ino))
+        bySize[stat.st_size].append(path)
+        if index % 500 == 0:
+            reportProgress("Comparing sizes", index, len(paths))
+
+    groups = [group for group in bySize.values() if len(group) > 1]
+    sizes = {path: size for size, group in bySize.items() for path in group}
+
+    candidates = [path for group in groups for path in group]
+    byPartial = collections.defaultdict(list)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for index, (path, digest) in enumerate(zip(candidates, executor.map(lambda path: partialDigest(path, sizes[path]), candidates))):
+            if isCancelled():
+                executor.shutdown(wait=False, cancel_futures=True)
+                return []
+            if digest is not None:
+                byPartial[(sizes[path], digest)].append(path)
+            if (index + 1) % 100 == 0 or index + 1 == len(candidates):
+                reportProgress("Comparing file heads and tails", index + 1, len(candidates))
+
+    groups = []
+    candidates = []
+    for (size, _), group in byPartial.items():
+        if len(group) < 2:
+            continue
+        if size <= 2 * DUPLICATE_PARTIAL_BYTES:
+            groups.append(group)  # The partial hash already covered the whole file
+        else:
+            candidates.extend(group)
+
+    byFull = collections.defaultdict(list)
+    if candidates:
+        # Spawned rather than forked, since this process already runs Qt and many threads
+        with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as executor:
+            for index, (path, digest) in enumerate(zip(candidates, executor.map(fullDigest, candidates, chunksize=4))):
+                if isCancelled():
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    return []
+                if digest is not None:
+                    byFull[(sizes[path], digest)].append(path)
+                if (index + 1) % 100 == 0 or index + 1 == len(candidates):
+                    reportProgress("Hashing candidates", index + 1, len(candidates))
+    groups.extend(group for group in byFull.values() if len(group) > 1)
+    return groups
+
+
+def compileSearchPattern(text):
+    # /regex/ or /regex/i is a regular expression, anything else is searched literally
+    match = re.fullmatch(r'/(.+)/(i?)', text, re.DOTALL)
+    if match:
+        flags = re.MULTILINE | (re.IGNORECASE if match.group(2) else 0)
+        return re.compile(match.group(1).encode('utf-8'), flags)
+    return re.compile(re.escape(text.encode('utf-8')))
+
+
+def fileContainsPattern(path, pattern, isCancelled):
+    try:
+        with open(path, 'rb') as file:
+            if b'\0' in file.read(SEARCH_SNIFF_BYTES):
+                return False  # Most likely a binary file
+            size = os.fstat(file.fileno()).st_size
+            if not size:
+                return False
+            # Search the mapped file a chunk at a time, so a cancel takes effect quickly on large files
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for start in range(0, size, SEARCH_CHUNK_BYTES):
+                    if isCancelled():
+                        return False
+                    # End each window on a line break, so $ and \b never match at an artificial cut
+                    end = start + SEARCH_CHUNK_BYTES + SEARCH_OVERLAP_BYTES
+                    if end < size:
+                        lineEnd = mapped.find(b'\n', end)
+                        end = size if lineEnd == -1 else lineEnd
+                    if pattern.search(mapped, start, min(size, end)):
+                        return True
+    except (OSError, ValueError):
+        pass
+    return False
+
+
+@functools.lru_cache(maxsize=1024)
+def compileTemplate(template):
+    # Parsed once per distinct template into (literal, field) pieces followed by the trailing literal
+    pieces = []
+    literal = ''
+    position = 0
+    for match in TEMPLATE_FIELD_PATTERN.finditer(template):
+        literal += template[position:match.start()]
+        position = match.end()
+        escaped, field = match.groups()
+        if escaped:
+            literal += '{' + escaped + '}'
+        else:
+            pieces.append((literal, field))
+            literal = ''
+    return tuple(pieces), literal + template[position:]
+
+
+def quoteArgument(text):
+    return f'"{text}"' if platform.system() == 'Windows' else shlex.quote(text)
+
+
+@functools.lru_cache(maxsize=65536)
+def pathParts(filePath):
+    # Quoted path parts, derived once per path however many rows or templates use them
+    name = os.path.basename(filePath)
+    stem, ext = os.path.splitext(name)
+    parts = {'path': filePath, 'dir': os.path.dirname(filePath) or '.', 'name': name, 'stem': stem, 'ext': ext}
+    return {field: quoteArgument(value) for field, value in parts.items()}
+
+
+def expandTemplate(compiledTemplate, parts):
+    pieces, tail = compiledTemplate
+    return ''.join(literal + parts[field] for literal, field in pieces) + tail
+
+
+def parseResourceLimits(text, directivesOnly=False):
+    # With directivesOnly, as in a row's comment, only the @-prefixed form counts
+    limits = {}
+    for at, key, value in RESOURCE_LIMIT_PATTERN.findall(text):
+        if directivesOnly and not at:
+            continue
+        try:
+            if key == 'nice':
+                if int(value) < 0:
+                    raise ValueError  # Raising the priority needs root
+                limits['nice'] = int(value)
+            elif key == 'timeout':
+                unit = value[-1] if value[-1:] in TIME_UNITS else ''
+                limits['timeout'] = float(value[:len(value) - len(unit)]) * TIME_UNITS[unit]
+            elif key == 'retries':
+                limits['retries'] = max(0, int(value))
+            elif key == 'cpus':
+                # e.g. 0-3,6
+                cpus = set()
+                for part in value.split(','):
+                    first, _, last = part.partition('-')
+                    cpus.update(range(int(first), int(last or first) + 1))
+                limits['cpus'] = cpus
+            else:
+                number = value.upper().rstrip('B')
+                unit = number[-1] if number[-1:] in MEMORY_UNITS else ''
+                limits['mem'] = int(float(number[:len(number) - len(unit)]) * MEMORY_UNITS[unit])
+        except (ValueError, IndexError):
+            print(f"Ignoring invalid resource limit: {key}={value}")
+    return limits
+
+
+def limitedCommand(command, limits):
+    # The command runs under nice, taskset and prlimit, so the limits are in place before it starts
+    # and are inherited by everything it spawns
+    if not limits or platform.system() == 'Windows':
+        return command
+    prefix = []
+    if 'nice' in limits:
+        prefix += ['nice', '-n', str(limits['nice'])]
+    if 'cpus' in limits:
+        prefix += ['taskset', '-c', ','.join(str(cpu) for cpu in sorted(limits['cpus']))]
+    if 'mem' in limits:
+        prefix += ['prlimit', f"--as={limits['mem']}", '--']
+    if not prefix:
+        return command  # Only a timeout or retries, which the scheduler handles
+    missing = [tool for tool in ('nice', 'taskset', 'prlimit') if tool in prefix and shutil.which(tool) is None]
+    if missing:
+        print(f"Running without resource limits, {', '.join(missing)} not found: {command}")
+        return command
+    return shlex.join(prefix + ['/bin/sh', '-c', command])
+
+
+def killProcessTree(process):
+    # Commands run in their own session, so the whole process group (grandchildren included)
+    # gets SIGTERM, and SIGKILL if any of it is still around after the grace period
+    if platform.system() == 'Windows':
+        if process.poll() is None:
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+    try:
+        if process.poll() is None and os.getpgid(process.pid) != process.pid:
+            process.terminate()  # Not a group leader; never signal our own group
+            return
+        os.killpg(process.pid, signal.SIGTERM)
+        deadline = time.monotonic() + KILL_GRACE_SECONDS
+        with contextlib.suppress(subprocess.TimeoutExpired):
+            process.wait(timeout=KILL_GRACE_SECONDS)
+        while time.monotonic() < deadline:
+            os.killpg(process.pid, 0)  # Raises once the whole group is gone
+            time.sleep(0.1)
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+# A row queued on the command queue, with its run options
+class CommandJob:
+    def __init__(self, item, command, limits, batch):
+        self.item = item  # fileListWidget item the job was built from, for reporting
+        self.command = command
+        self.limits = limits
+        self.timeout = limits.get('timeout')
+        self.retries = limits.get('retries', 0)
+        self.batch = batch
+
+
+# Jobs queued together; onFinished runs (on a scheduler thread) once every job is done or skipped
+class CommandBatch:
+    def __init__(self, size, onJobFinished, onFinished):
+        self.remaining = size
+        self.failures = []
+        self.lock = threading.Lock()
+        self.onJobFinished = onJobFinished
+        self.onFinished = onFinished
+
+    def finish(self, job, error, stopped=False):
+        with self.lock:
+            if error:
+                self.failures.append((job, error))
+            self.remaining -= 1
+            done = self.remaining == 0
+        if not stopped:
+            self.onJobFinished(job, error)
+        if done:
+            self.onFinished(self)
+
+
+def readSystemLoad():
+    # (1-minute load average, available bytes, total bytes), or None where /proc is missing
+    try:
+        with open('/proc/loadavg') as file:
+            load = float(file.read().split()[0])
+        memory = {}
+        with open('/proc/meminfo') as file:
+            for line in file:
+                key, value = line.split(':', 1)
+                memory[key] = int(value.split()[0]) * 1024
+        return load, memory['MemAvailable'], memory['MemTotal']
+    except (OSError, ValueError, KeyError, IndexError):
+        return None
+
+
+# Lets more jobs start while the CPUs have spare capacity, and holds them back when memory runs low.
+# Jobs are admitted in ticket order, so with a single slot they still run in list order
+class ResourceGovernor:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.running = 0
+        self.nextTicket = 0
+        self.nowServing = 0
+        self.abandonedTickets = set()
+
+    def takeTicket(self):
+        with self.condition:
+            ticket = self.nextTicket
+            self.nextTicket += 1
+            return ticket
+
+    def allowedJobs(self, maxJobs):
+        systemLoad = readSystemLoad()
+        if systemLoad is None:
+            return maxJobs
+        load, available, total = systemLoad
+        if available < total * GOVERNOR_MEMORY_RESERVE:
+            return max(1, self.running)  # Start nothing new until memory frees up
+        # The load average already counts our own running jobs
+        spareCpus = int((os.cpu_count() or 1) - load)
+        return max(1, min(maxJobs, self.running + spareCpus))
+
+    def acquire(self, maxJobs, isCancelled, ticket=None):
+        with self.condition:
+            if ticket is None:
+                ticket = self.takeTicket()
+            while True:
+                if isCancelled():
+                    # Give up the ticket so the jobs behind it are not held up
+                    self.abandonedTickets.add(ticket)
+                    self.skipAbandonedTickets()
+                    return False
+                if ticket == self.nowServing and self.running < self.allowedJobs(maxJobs):
+                    break
+                self.condition.wait(GOVERNOR_POLL_SECONDS)
+            self.running += 1
+            self.nowServing += 1
+            self.skipAbandonedTickets()
+            return True
+
+    def skipAbandonedTickets(self):
+        while self.nowServing in self.abandonedTickets:
+            self.abandonedTickets.remove(self.nowServing)
+            self.nowServing += 1
+        self.condition.notify_all()
+
+    def release(self):
+        with self.condition:
+            self.running -= 1
+            self.condition.notify_all()
+
+
+def estimateMakespan(durations, workers):
+    # Greedy list scheduling: each job starts on whichever worker frees up first
+    finishTimes = [0.0] * max(1, workers)
+    for duration in durations:
+        heapq.heappush(finishTimes, heapq.heappop(finishTimes) + duration)
+    return max(finishTimes)
+
+
+def formatDuration(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m {seconds:02d}s" if hours else f"{minutes}m {seconds:02d}s"
+
+
 class DraggableListWidget(QListWidget):
     def __init__(self, currentFontSize):
         super().__init__()
@@ -213,23 +870,44 @@ class FilePathsPlaceholder(QWidget):
         self.setWindowTitle('File Paths Placeholder')
         self.resize(500, 600)
         self.executor = ThreadPoolExecutor(max_workers=2)  # For managing subprocesses
+        self.launcher = BatchLauncher(self.reportOpenFailures)
+        self.contentSearchCancelled = None  # Set while a content search is running
+        self.contentFilterActive = False  # Read while setupUI loads the last list
         self.setupUI()
         self.stopAllCommands = False  # Flag to control stopping of all commands
+        self.runningProcesses = set()  # Every running command or pipeline stage
+        self.watchTimers = {}  # Debounce timer per watched path
+        self.watchProcesses = {}  # In-flight run per watched row token (list items are not hashable)
+        self.nextWatchToken = 1
+        self.watchPruneTimer = QTimer(self)
+        self.watchPruneTimer.setSingleShot(True)
+        self.watchPruneTimer.timeout.connect(self.pruneWatchedRuns)
+        self.fileListWidget.model().rowsRemoved.connect(self.watchPruneTimer.start)
+        self.fileWatcher = QFileSystemWatcher(self)
+        self.fileWatcher.fileChanged.connect(self.onWatchedPathChanged)
+        self.fileWatcher.directoryChanged.connect(self.onWatchedPathChanged)
+        self.activeBatch = None  # Set while a batch of queued commands is running
         self.commandQueue = queue.Queue()
-        self.commandThread = threading.Thread(target=self.processCommandQueue)
-        self.commandThread.daemon = True
-        self.commandThread.start()
+        self.dequeueLock = threading.Lock()
+        self.schedulerThreads = [threading.Thread(target=self.processCommandQueue, daemon=True) for _ in range(SCHEDULER_THREADS)]
+        for thread in self.schedulerThreads:
+            thread.start()
 
     def setupUI(self):
         self.createFilePPFolder()
         self.currentFontSize = self.loadFontSize()
+        self.runAllWorkers = self.loadRunAllWorkers()
+        self.globalResourceLimits = self.loadResourceLimits()
+        self.governor = ResourceGovernor()
         self.setupListWidgets()
         self.setupButtons()
         self.setupLayout()
+        self.loadWorkspaces()
         self.loadLastUsedList()
         self.leftListWidget.installEventFilter(self)
         self.rightListWidget.installEventFilter(self)
         QApplication.instance().aboutToQuit.connect(self.saveLastUsedListPath)
+        QApplication.instance().aboutToQuit.connect(self.saveWorkspaces)
 
     def eventFilter(self, source, event):
         if event.type() == QEvent.KeyPress:
@@ -254,17 +932,24 @@ class FilePathsPlaceholder(QWidget):
         os.makedirs(self.filepp_folder, exist_ok=True)
         self.current_list_file = os.path.join(self.filepp_folder, CURRENT_LIST_FILENAME)
         self.font_size_file = os.path.join(self.filepp_folder, FONT_SIZE_FILENAME)
+        self.run_all_workers_file = os.path.join(self.filepp_folder, RUN_ALL_WORKERS_FILENAME)
+        self.resource_limits_file = os.path.join(self.filepp_folder, RESOURCE_LIMITS_FILENAME)
+        self.workspaces_file = os.path.join(self.filepp_folder, WORKSPACES_FILENAME)
+        self.memory_budget_file = os.path.join(self.filepp_folder, MEMORY_BUDGET_FILENAME)
+        self.workspace_folder = os.path.join(self.filepp_folder, WORKSPACE_FOLDER)
+        os.makedirs(self.workspace_folder, exist_ok=True)
+        self.runHistory = RunHistory(os.path.join(self.filepp_folder, RUN_HISTORY_FILENAME))
 
     def applyListStyle(self, listWidget):
         listWidget.setFont(QFont("Arial", self.currentFontSize))
         itemHeight = 22  # Set this to your desired default item height
         listWidget.setStyleSheet(f"""
-            QListWidget::item {{
+            QListView::item {{
                 border-bottom: 1px solid #dcdcdc;  /* Line separator */
                 padding: 4px;                     /* Add some padding */
                 height: {itemHeight}px;          /* Fixed item height */
             }}
-            QListWidget::item:selected {{
+            QListView::item:selected {{
                 background-color: #5DADE2;       /* Background color for selected item */
                 color: black;                    /* Text color for selected item */
             }}
@@ -274,6 +959,11 @@ class FilePathsPlaceholder(QWidget):
         self.fileListWidget = DraggableListWidget(self.currentFontSize)
         self.fileListWidget.setMinimumWidth(400)
         self.applyListStyle(self.fileListWidget)
+        self.metadataRepaintPending = False
+        self.metadataCache = FileMetadataCache(self.scheduleMetadataRepaint)
+        self.metadataDelegate = FileMetadataDelegate(self.metadataCache, self.fileListWidget)
+        self.fileListWidget.setItemDelegate(self.metadataDelegate)
+        self.fileListWidget.verticalScrollBar().valueChanged.connect(self.prefetchVisibleMetadata)
         self.fileListWidget.itemDoubleClicked.connect(self.executeFilePath)
         self.fileListWidget.itemSelectionChanged.connect(lambda: self.clearOtherSelections(self.fileListWidget))
 
@@ -298,8 +988,24 @@ class FilePathsPlaceholder(QWidget):
         self.rightListWidget.itemDoubleClicked.connect(self.editItemText)
         self.rightListWidget.itemSelectionChanged.connect(lambda: self.clearOtherSelections(self.rightListWidget))
 
+        # Read-only column with the exact command each row runs
+        self.commandPreviewModel = CommandPreviewModel(self)
+        self.commandPreviewView = CommandPreviewView()
+        self.commandPreviewView.setModel(self.commandPreviewModel)
+        self.commandPreviewView.setMinimumWidth(300)
+        self.commandPreviewView.hide()
+        self.applyListStyle(self.commandPreviewView)
+        self.previewRefreshTimer = QTimer(self)
+        self.previewRefreshTimer.setSingleShot(True)
+        self.previewRefreshTimer.timeout.connect(self.refreshCommandPreview)
+        for listWidget in [self.leftListWidget, self.fileListWidget, self.rightListWidget]:
+            model = listWidget.model()
+            for changeSignal in [model.rowsInserted, model.rowsRemoved, model.rowsMoved, model.dataChanged, model.modelReset]:
+                # Straight to the timer's slot, so Qt drops the connection once the timer is destroyed
+                changeSignal.connect(self.previewRefreshTimer.start)
+
         # Connect their scrolls
-        allWidgets = [self.playListWidget, self.leftListWidget, self.fileListWidget, self.rightListWidget]
+        allWidgets = [self.playListWidget, self.leftListWidget, self.fileListWidget, self.rightListWidget, self.commandPreviewView]
         for widget in allWidgets:
             widget.connectScroll(allWidgets)
 
@@ -332,23 +1038,66 @@ class FilePathsPlaceholder(QWidget):
         self.runAllButton.clicked.connect(self.runAllPlayItems)
         self.runAllButton.setDisabled(True)
 
+        # Button for running the selected rows as one pipeline (stdout -> next stdin)
+        self.pipelineButton = QPushButton("⛓")
+        self.pipelineButton.setFixedSize(50, 50)
+        self.pipelineButton.setFont(QFont("Arial", 24))
+        self.pipelineButton.clicked.connect(self.runSelectedAsPipeline)
+        self.pipelineButton.setDisabled(True)
+
         self.increaseFontShortcut = QShortcut(QKeySequence("Ctrl+="), self)
         self.decreaseFontShortcut = QShortcut(QKeySequence("Ctrl+-"), self)
         self.increaseFontShortcut.activated.connect(lambda: self.changeFontSize(True))
         self.decreaseFontShortcut.activated.connect(lambda: self.changeFontSize(False))
 
+        self.watchShortcut = QShortcut(QKeySequence("Ctrl+W"), self)
+        self.watchShortcut.activated.connect(self.toggleWatchSelectedRows)
+
+        self.runAllWorkersShortcut = QShortcut(QKeySequence("Ctrl+J"), self)
+        self.runAllWorkersShortcut.activated.connect(self.changeRunAllWorkers)
+        self.resourceLimitsShortcut = QShortcut(QKeySequence("Ctrl+L"), self)
+        self.resourceLimitsShortcut.activated.connect(self.changeResourceLimits)
+
+        self.openShortcut = QShortcut(QKeySequence("Ctrl+O"), self)
+        self.openShortcut.activated.connect(lambda: self.openFilePaths([item.text() for item in self.fileListWidget.selectedItems()]))
+
+        self.metadataShortcut = QShortcut(QKeySequence("Ctrl+I"), self)
+        self.metadataShortcut.activated.connect(self.toggleMetadataColumns)
+        self.sortShortcut = QShortcut(QKeySequence("Ctrl+Shift+S"), self)
+        self.sortShortcut.activated.connect(self.sortFileList)
+
+        self.duplicatesShortcut = QShortcut(QKeySequence("Ctrl+D"), self)
+        self.duplicatesShortcut.activated.connect(self.findDuplicates)
+
+        self.searchShortcut = QShortcut(QKeySequence("Ctrl+F"), self)
+        self.searchShortcut.activated.connect(self.searchFileContents)
+
+        # Tabs for named lists; the bar stays hidden while there is only one list
+        self.workspaceTabBar = QTabBar()
+        self.workspaceTabBar.setTabsClosable(True)
+        self.workspaceTabBar.setAutoHide(True)
+        self.workspaceTabBar.currentChanged.connect(self.switchWorkspace)
+        self.workspaceTabBar.tabCloseRequested.connect(self.closeWorkspace)
+        self.newWorkspaceShortcut = QShortcut(QKeySequence("Ctrl+T"), self)
+        self.newWorkspaceShortcut.activated.connect(self.newWorkspace)
+
+        self.previewShortcut = QShortcut(QKeySequence("Ctrl+E"), self)
+        self.previewShortcut.activated.connect(lambda: self.commandPreviewView.setVisible(not self.commandPreviewView.isVisible()))
+
     def setupLayout(self):
         listLayout = QHBoxLayout()
         listLayout.addWidget(self.playListWidget, 1)
         listLayout.addWidget(self.leftListWidget, 1)
         listLayout.addWidget(self.fileListWidget, 2)
         listLayout.addWidget(self.rightListWidget, 1)
+        listLayout.addWidget(self.commandPreviewView, 2)
 
         buttonLayout = QHBoxLayout()
-        for button in [self.runAllButton, self.expandButton, self.exportButton, self.importButton, self.refreshButton, self.addButton]:
+        for button in [self.runAllButton, self.pipelineButton, self.expandButton, self.exportButton, self.importButton, self.refreshButton, self.addButton]:
             buttonLayout.addWidget(button)
 
         mainLayout = QVBoxLayout()
+        mainLayout.addWidget(self.workspaceTabBar)
         mainLayout.addLayout(listLayout)
         mainLayout.addLayout(buttonLayout)
         self.setLayout(mainLayout)
@@ -392,80 +1141,92 @@ class FilePathsPlaceholder(QWidget):
     def updatePlayListWidget(self):
         currentScrollPos = self.playListWidget.verticalScrollBar().value()
 
-        # Check if update is necessary: either count differs or items are out of sync
-        update_needed = self.playListWidget.count() != self.leftListWidget.count()
-        if not update_needed:
+        if self.playListWidget.count() == self.leftListWidget.count():
+            # Only rows that gained or lost their command are updated, e.g. after a sort or an edit
             for i in range(self.leftListWidget.count()):
-                leftItemText = self.leftListWidget.item(i).text()
-                playItemWidget = self.playListWidget.itemWidget(self.playListWidget.item(i))
-                playItemText = playItemWidget.text() if playItemWidget else ""
-                if (leftItemText and playItemText != "▶") or (not leftItemText and playItemText):
-                    update_needed = True
-                    break
-
-        if update_needed:
+                hasCommand = bool(self.leftListWidget.item(i).text())
+                playItem = self.playListWidget.item(i)
+                playItemWidget = self.playListWidget.itemWidget(playItem)
+                if hasCommand and not playItemWidget:
+                    self.playListWidget.setItemWidget(playItem, self.createPlayLabel())
+                elif not hasCommand and playItemWidget:
+                    self.playListWidget.removeItemWidget(playItem)
+        else:
             self.playListWidget.clear()
             for i in range(self.leftListWidget.count()):
                 itemText = self.leftListWidget.item(i).text()
                 if itemText:
                     playItem = QListWidgetItem(self.playListWidget)
-                    playLabel = QLabel("▶")
-                    playLabel.setAlignment(Qt.AlignCenter)
-                    playLabel.setFont(QFont("Arial", 14))
-                    # Adjust these values as needed to match the item height in other lists
-                    # playLabel.setMinimumHeight(20)
-                    # playLabel.setMaximumHeight(24)
-                    self.playListWidget.setItemWidget(playItem, playLabel)
+                    self.playListWidget.setItemWidget(playItem, self.createPlayLabel())
                 else:
                     self.playListWidget.addItem(QListWidgetItem(""))
+            self.reapplyContentFilter()
 
         self.playListWidget.verticalScrollBar().setValue(currentScrollPos)
 
+    def createPlayLabel(self):
+        playLabel = QLabel("▶")
+        playLabel.setAlignment(Qt.AlignCenter)
+        playLabel.setFont(QFont("Arial", 14))
+        # Adjust these values as needed to match the item height in other lists
+        # playLabel.setMinimumHeight(20)
+        # playLabel.setMaximumHeight(24)
+        return playLabel
+
     def onPlayButtonClick(self, item):
         row = self.playListWidget.currentRow()
         if row != -1 and self.fileListWidget.item(row) and self.fileListWidget.item(row).text().strip():
-            self.disableInteraction()
-            command = self.constructCommandForRow(row)
-
-            # Execute the command in a separate thread
-            self.commandThread = threading.Thread(target=lambda: self.runCommand(command))
-            self.commandThread.start()
-
-    # def runCommand(self, command):
-    #     self.runningProcess = subprocess.Popen(command, shell=True)
-    #     self.runningProcess.wait()  # Wait for the process to complete
-    #     self.enableInteraction()    # Re-enable interaction after completion
-        
-    def runCommand(self, command):
-        # Disable interaction if needed before starting the command
-        self.disableInteraction()
-        self.runningProcess = None  # Initialize runningProcess
-        self.commandThread = threading.Thread(target=lambda: self.executeCommand(command))
-        self.commandThread.start()
-
-    def executeCommand(self, command):
+            # Run through the scheduler, so the row's timeout and retries apply
+            self.scheduleJobs(self.createJobs([row]))
+
+    def executeCommand(self, command, limits=None, timeout=None):
+        # Returns (exit status, timed out); the status is None if the command was stopped or could not start
+        process = None
+        timer = None
+        timedOut = threading.Event()
+        returnCode = None
         try:
             # Execute the command and handle output
-            process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            startTime = time.monotonic()
+            process = subprocess.Popen(limitedCommand(command, limits), shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                       start_new_session=platform.system() != 'Windows')
             self.runningProcess = process  # Track the running process
+            self.runningProcesses.add(process)  # Several commands may run at once during Run All
+
+            if timeout:
+                def expire():
+                    timedOut.set()
+                    killProcessTree(process)
+                timer = threading.Timer(timeout, expire)
+                timer.daemon = True
+                timer.start()
 
             # Read output line by line
             for line in process.stdout:
                 print(line.strip())
-                if self.runningProcess is None:
-                    break  # Stop if runningProcess is cleared
+                if process not in self.runningProcesses:
+                    break  # Stop if the process was terminated
 
-            if self.runningProcess:
+            if process in self.runningProcesses:
                 _, errors = process.communicate()
                 if errors:
                     print(f"Errors: {errors.strip()}")
+                returnCode = process.returncode
+                if returnCode == 0 and not timedOut.is_set():  # Failed runs would skew the estimates
+                    self.runHistory.record(command, time.monotonic() - startTime)
 
         except Exception as e:
             print(f"An error occurred: {e}")
         finally:
-            self.runningProcess = None
-            self.enableInteraction()
-            self.playListWidget.setFocus()  # Set focus back to playListWidget
+            if timer:
+                timer.cancel()
+            self.runningProcesses.discard(process)
+            if self.runningProcess is process:
+                self.runningProcess = None
+            if not self.runningProcesses and self.activeBatch is None:
+                self.enableInteraction()
+                self.playListWidget.setFocus()  # Set focus back to playListWidget
+        return returnCode, timedOut.is_set()
 
     def disableInteraction(self):
         # Disable main interaction parts, not the entire GUI
@@ -473,6 +1234,7 @@ class FilePathsPlaceholder(QWidget):
         self.leftListWidget.setDisabled(True)
         self.rightListWidget.setDisabled(True)
         self.playListWidget.setDisabled(True)
+        self.workspaceTabBar.setDisabled(True)
 
     def enableInteraction(self):
         # Re-enable the previously disabled elements
@@ -480,6 +1242,7 @@ class FilePathsPlaceholder(QWidget):
         self.leftListWidget.setDisabled(False)
         self.rightListWidget.setDisabled(False)
         self.playListWidget.setDisabled(False)
+        self.workspaceTabBar.setDisabled(False)
 
     def selectAllItems(self, listWidget):
         listWidget.selectAll()
@@ -496,7 +1259,7 @@ class FilePathsPlaceholder(QWidget):
         newFontSize = self.currentFontSize + 1 if increase and self.currentFontSize < 30 else self.currentFontSize - 1 if not increase and self.currentFontSize > 12 else self.currentFontSize
         if newFontSize != self.currentFontSize:
             self.currentFontSize = newFontSize
-            for listWidget in [self.playListWidget, self.fileListWidget, self.leftListWidget, self.rightListWidget]:  # Include playListWidget
+            for listWidget in [self.playListWidget, self.fileListWidget, self.leftListWidget, self.rightListWidget, self.commandPreviewView]:  # Include playListWidget
                 self.applyListStyle(listWidget)
 
     def editItemText(self, item):
@@ -527,6 +1290,7 @@ class FilePathsPlaceholder(QWidget):
 
         # Toggle enabled state of the new button
         self.runAllButton.setEnabled(self.playListWidget.isVisible())
+        self.pipelineButton.setEnabled(self.playListWidget.isVisible())
 
         # Update playListWidget to sync with leftListWidget if it's being made visible
         if self.playListWidget.isVisible():
@@ -544,48 +1308,617 @@ class FilePathsPlaceholder(QWidget):
             QMessageBox.warning(self, "No runnable commands", "There are no commands to run.")
             return
 
+        rows = [row for row in range(self.playListWidget.count())
+                if self.playListWidget.itemWidget(self.playListWidget.item(row))
+                and self.playListWidget.itemWidget(self.playListWidget.item(row)).text() == "▶"]
+        jobs = self.createJobs(rows)
+
+        # Offer longest-processing-time-first order once some of the commands have a history;
+        # with a single job at a time the order cannot change the total time
+        estimates = self.runHistory.estimates([job.command for job in jobs]) if self.runAllWorkers > 1 else {}
+        if estimates:
+            jobs = self.chooseRunAllOrder(jobs, estimates)
+            if not jobs:
+                return  # User cancelled
+
+        self.scheduleJobs(jobs)
+
+    def createJobs(self, rows):
+        batch = CommandBatch(len(rows), self.onJobFinished, self.onBatchFinished)
+        return [CommandJob(self.fileListWidget.item(row), command, limits, batch)
+                for row, command, limits in zip(rows, self.constructCommandsForRows(rows), self.resourceLimitsForRows(rows))]
+
+    def scheduleJobs(self, jobs):
+        if not jobs or self.activeBatch is not None:
+            return
         self.disableInteraction()  # Disable interaction at the start
         self.stopAllCommands = False  # Reset the stop flag before starting
+        self.activeBatch = jobs[0].batch
+        for job in jobs:
+            self.commandQueue.put(job)
 
-        def run_command(row):
-            if self.stopAllCommands:  # Check if stopping is requested before running the command
+    def processCommandQueue(self):
+        while True:
+            # Jobs take their governor ticket in queue order, whichever thread picks them up
+            with self.dequeueLock:
+                job = self.commandQueue.get()
+                ticket = self.governor.takeTicket()
+            try:
+                if job:
+                    self.runJob(job, ticket)
+                else:
+                    self.governor.acquire(0, lambda: True, ticket)  # Nothing to run; release the ticket
+            except Exception as e:
+                print(f"An error occurred: {e}")
+            finally:
+                self.commandQueue.task_done()
+
+    def runJob(self, job, ticket):
+        error = None
+        for attempt in range(job.retries + 1):
+            if attempt:
+                # Exponential backoff between attempts, cut short if the batch is stopped
+                delay = min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+                deadline = time.monotonic() + delay
+                while time.monotonic() < deadline and not self.stopAllCommands:
+                    time.sleep(0.1)
+
+            # The governor decides how many of the scheduler threads may run a command right now;
+            # retries queue up again behind the jobs already waiting
+            if not self.governor.acquire(self.runAllWorkers, lambda: self.stopAllCommands, ticket if not attempt else None):
+                job.batch.finish(job, None, stopped=True)
                 return
-            if row < self.playListWidget.count():
-                playItemWidget = self.playListWidget.itemWidget(self.playListWidget.item(row))
-                if playItemWidget and playItemWidget.text() == "▶":
-                    command = self.constructCommandForRow(row)
-                    self.executeCommand(command)
-                    if self.stopAllCommands:  # Check if stopping is requested after running the command
-                        return
-
-        # Running the commands in a separate thread
-        self.commandThread = threading.Thread(target=lambda: [run_command(row) for row in range(self.playListWidget.count())])
+            try:
+                returnCode, timedOut = self.executeCommand(job.command, job.limits, job.timeout)
+            finally:
+                self.governor.release()
+
+            if returnCode == 0:
+                error = None
+                break
+            if returnCode is None and not timedOut and self.stopAllCommands:
+                job.batch.finish(job, None, stopped=True)
+                return
+            error = f"timed out after {job.timeout:g}s" if timedOut else \
+                    f"exit status {returnCode}" if returnCode is not None else "could not be started"
+            if attempt < job.retries:
+                print(f"Command failed ({error}), retrying: {job.command}")
+            elif job.retries:
+                error += f" (after {job.retries + 1} attempts)"
+
+        job.batch.finish(job, error)
+
+    def onJobFinished(self, job, error):
+        def markRow():
+            # Failed rows are highlighted with the reason as tooltip until they run successfully
+            if self.fileListWidget.row(job.item) == -1:
+                return
+            if error:
+                job.item.setData(FAILURE_ROLE, error)
+                job.item.setToolTip(f"Failed: {error}")
+            elif job.item.data(FAILURE_ROLE):
+                job.item.setData(FAILURE_ROLE, None)
+                job.item.setToolTip("")
+            self.updateRowBackground(job.item)
+        QApplication.instance().postEvent(self, CustomEvent(markRow))
+
+    def updateRowBackground(self, item):
+        # A failure outweighs the duplicate group color; the group color shows again once the row runs fine
+        color = FAILURE_COLOR if item.data(FAILURE_ROLE) else item.data(DUPLICATE_ROLE)
+        item.setData(Qt.BackgroundRole, QColor(color) if color else None)
+
+    def onBatchFinished(self, batch):
+        def finish():
+            self.activeBatch = None
+            if not self.runningProcesses:
+                self.enableInteraction()
+                self.playListWidget.setFocus()  # Set focus back to playListWidget
+            if batch.failures:
+                # Non-modal, so the next batch can be started right away
+                self.commandFailureBox = QMessageBox(QMessageBox.Warning, "Run Failures",
+                                                     f"{len(batch.failures)} command(s) failed.", QMessageBox.Ok, self)
+                self.commandFailureBox.setDetailedText("\n".join(f"{job.item.text()}: {error}" for job, error in batch.failures))
+                self.commandFailureBox.setModal(False)
+                self.commandFailureBox.show()
+        QApplication.instance().postEvent(self, CustomEvent(finish))
+
+    def chooseRunAllOrder(self, jobs, estimates):
+        # Commands without a history are assumed to take as long as an average known command
+        fallback = sum(estimates.values()) / len(estimates)
+        durations = [estimates.get(job.command, fallback) for job in jobs]
+        longestFirst = [job for _, job in sorted(zip(durations, jobs), key=lambda pair: pair[0], reverse=True)]
+        listOrderMakespan = estimateMakespan(durations, self.runAllWorkers)
+        longestFirstMakespan = estimateMakespan(sorted(durations, reverse=True), self.runAllWorkers)
+        unknown = sum(1 for job in jobs if job.command not in estimates)
+
+        messageBox = QMessageBox(self)
+        messageBox.setWindowTitle("Run All")
+        messageBox.setText(f"{len(jobs)} commands on {self.runAllWorkers} parallel job(s).\n\n"
+                           f"Estimated time in list order: {formatDuration(listOrderMakespan)}\n"
+                           f"Estimated time longest first: {formatDuration(longestFirstMakespan)}")
+        if unknown:
+            messageBox.setInformativeText(f"{unknown} command(s) have never been run and are estimated from the average.")
+        longestFirstButton = messageBox.addButton("Longest First", QMessageBox.AcceptRole)
+        listOrderButton = messageBox.addButton("List Order", QMessageBox.AcceptRole)
+        messageBox.addButton(QMessageBox.Cancel)
+        messageBox.setDefaultButton(listOrderButton)  # Enter keeps the usual top-to-bottom order
+        messageBox.exec_()
+
+        if messageBox.clickedButton() is longestFirstButton:
+            return longestFirst
+        if messageBox.clickedButton() is listOrderButton:
+            return jobs
+        return []
+
+    def changeRunAllWorkers(self):
+        workers, ok = QInputDialog.getInt(self, "Parallel Jobs", "Number of commands Run All runs at the same time:",
+                                          self.runAllWorkers, 1, os.cpu_count() or 1)
+        if ok:
+            self.runAllWorkers = workers
+            self.saveRunAllWorkers()
+
+    def changeResourceLimits(self):
+        text, ok = QInputDialog.getText(self, "Resource Limits",
+                                        "Limits for every command, e.g. nice=10 cpus=0-3 mem=4G timeout=30m retries=2\n(rows can override them with @nice=... after :} on the right):",
+                                        text=self.globalResourceLimitsText)
+        if ok:
+            self.globalResourceLimitsText = text.strip()
+            self.globalResourceLimits = parseResourceLimits(self.globalResourceLimitsText)
+            self.saveResourceLimits()
+
+    def resourceLimitsForRows(self, rows):
+        limitsList = []
+        for row in rows:
+            rightItemText = self.rightListWidget.item(row).text() if self.rightListWidget.item(row) else ""
+            _, _, comment = rightItemText.partition(':}')
+            limitsList.append({**self.globalResourceLimits, **parseResourceLimits(comment, directivesOnly=True)})
+        return limitsList
+
+    def selectedRows(self):
+        # Rows selected in whichever of the file or side lists currently holds the selection
+        for listWidget in [self.fileListWidget, self.leftListWidget, self.rightListWidget]:
+            rows = sorted(listWidget.row(item) for item in listWidget.selectedItems())
+            if rows:
+                return rows
+        return []
+
+    def runSelectedAsPipeline(self):
+        # Only rows with a command on the left take part in the pipeline
+        rows = [row for row in self.selectedRows()
+                if self.leftListWidget.item(row) and self.leftListWidget.item(row).text()
+                and self.fileListWidget.item(row) and self.fileListWidget.item(row).text().strip()]
+
+        if len(rows) < 2:
+            QMessageBox.warning(self, "No pipeline", "Select at least two runnable rows to chain as a pipeline.")
+            return
+
+        commands = self.constructCommandsForRows(rows)
+        limitsList = self.resourceLimitsForRows(rows)
+        self.disableInteraction()
+        self.stopAllCommands = False
+        self.commandThread = threading.Thread(target=lambda: self.executePipeline(commands, limitsList))
         self.commandThread.start()
 
-    def constructCommandForRow(self, row):
-        leftItemText = self.leftListWidget.item(row).text() if self.leftListWidget.item(row) else ""
-        filePath = self.fileListWidget.item(row).text() if self.fileListWidget.item(row) else ""
-        rightItemText = self.rightListWidget.item(row).text() if self.rightListWidget.item(row) else ""
+    def executePipeline(self, commands, limitsList=None):
+        processes = []
+        try:
+            # Each stage reads straight from the previous stage's stdout fd, like a shell pipe,
+            # so the data never passes through Python and all stages run at the same time
+            previousStdout = None
+            for index, command in enumerate(commands):
+                limits = limitsList[index] if limitsList else None
+                process = subprocess.Popen(limitedCommand(command, limits), shell=True, stdin=previousStdout, stdout=subprocess.PIPE,
+                                           start_new_session=platform.system() != 'Windows')
+                processes.append(process)
+                self.runningProcesses.add(process)
+                if previousStdout is not None:
+                    previousStdout.close()  # Only the next stage keeps the read end, so EOF/SIGPIPE propagate
+                previousStdout = process.stdout
+            self.runningProcess = processes[-1]  # Track the last stage like a single command
+
+            # Read the output of the last stage line by line; it may well be binary, e.g. after an encoder
+            for line in processes[-1].stdout:
+                print(line.decode('utf-8', errors='replace').strip())
+                if self.runningProcess is None:
+                    break  # Stop if runningProcess is cleared
 
-        # Special handling for ':}' in filePath
-        if filePath.startswith(':}'):
-            filePath = filePath[2:].lstrip()
+            for index, process in enumerate(processes):
+                returnCode = process.wait()
+                if returnCode and self.runningProcess:
+                    print(f"Pipeline stage {index + 1} exited with status {returnCode}")
 
-        # Splitting rightItemText at ':}' if present
-        rightItemText = rightItemText.split(':}')[0]
+        except Exception as e:
+            print(f"An error occurred: {e}")
+        finally:
+            for process in processes:
+                if process.poll() is None:
+                    process.terminate()
+                self.runningProcesses.discard(process)
+            self.runningProcess = None
+            self.enableInteraction()
+            self.playListWidget.setFocus()  # Set focus back to playListWidget
 
-        # Constructing the command based on the platform
-        command = f'{leftItemText} "{filePath}" {rightItemText}' if platform.system() == 'Windows' else f'{leftItemText} {shlex.quote(filePath)} {rightItemText}'
+    def toggleWatchSelectedRows(self):
+        for row in self.selectedRows():
+            item = self.fileListWidget.item(row)
+            if not item:
+                continue
+            path = item.text()
+            if item.data(WATCH_ROLE):
+                self.stopWatchedRun(item.data(WATCH_ROLE))
+                item.setData(WATCH_ROLE, None)
+                item.setData(Qt.ForegroundRole, None)
+                if not self.watchedItemsForPath(path):
+                    self.fileWatcher.removePath(path)
+            elif not path.startswith(':}') and os.path.exists(path):
+                item.setData(WATCH_ROLE, self.nextWatchToken)
+                self.nextWatchToken += 1
+                item.setForeground(QColor("#1E8449"))  # Watched rows are shown in green
+                self.fileWatcher.addPath(path)
+
+    def watchedItemsForPath(self, path):
+        return [item for item in self.fileListWidget.findItems(path, Qt.MatchExactly) if item.data(WATCH_ROLE)]
+
+    def onWatchedPathChanged(self, path):
+        # Editors often save by replacing the file, which drops it from the watcher
+        if os.path.exists(path) and path not in self.fileWatcher.files() + self.fileWatcher.directories():
+            self.fileWatcher.addPath(path)
+        self.metadataCache.invalidate(path)
+
+        # Coalesce a burst of change events into a single run
+        timer = self.watchTimers.get(path)
+        if timer is None:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.setInterval(WATCH_DEBOUNCE_MS)
+            timer.timeout.connect(lambda: self.rerunWatchedPath(path))
+            self.watchTimers[path] = timer
+        timer.start()
+
+    def rerunWatchedPath(self, path):
+        items = self.watchedItemsForPath(path)
+        if not items:
+            # Every watched row for this path was removed or unwatched
+            self.fileWatcher.removePath(path)
+            self.watchTimers.pop(path).deleteLater()
+            return
 
-        return command
-    
-    def processCommandQueue(self):
-        while True:
-            command = self.commandQueue.get()
-            if command:
-                self.executeCommand(command)
-            self.commandQueue.task_done()
+        # A save that renames the old file away and writes the new one a moment later drops the path
+        # from the watcher before the new file exists, so it is added back once the saves settled
+        if not os.path.exists(path):
+            print(f"Watched file is gone, not running: {path}")
+            return
+        if path not in self.fileWatcher.files() + self.fileWatcher.directories():
+            self.fileWatcher.addPath(path)
 
+        for item in items:
+            row = self.fileListWidget.row(item)
+            if not (self.leftListWidget.item(row) and self.leftListWidget.item(row).text()):
+                continue
+            command = self.constructCommandForRow(row)
+
+            # A run still in flight for this row is stale now, so cancel it before starting again
+            token = item.data(WATCH_ROLE)
+            self.stopWatchedRun(token)
+            try:
+                # Started here rather than in the worker thread, so the run is registered before
+                # the next change can arrive; its own session lets it be stopped with its children
+                process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                                           start_new_session=platform.system() != 'Windows')
+            except Exception as e:
+                print(f"An error occurred: {e}")
+                continue
+            self.watchProcesses[token] = process
+            threading.Thread(target=lambda token=token, process=process: self.executeWatchedCommand(token, process), daemon=True).start()
+
+    def executeWatchedCommand(self, token, process):
+        # Watched runs do not lock the GUI, so the list can keep being used as a dashboard
+        try:
+            for line in process.stdout:
+                print(line.strip())
+            process.wait()
+        except Exception as e:
+            print(f"An error occurred: {e}")
+        finally:
+            if self.watchProcesses.get(token) is process:
+                self.watchProcesses.pop(token, None)
+
+    def stopWatchedRun(self, token):
+        process = self.watchProcesses.pop(token, None)
+        if process and process.poll() is None:
+            # The grace period before SIGKILL is waited out in the background
+            threading.Thread(target=killProcessTree, args=(process,), daemon=True).start()
+
+    def stopWatchedRuns(self):
+        for token in list(self.watchProcesses):
+            self.stopWatchedRun(token)
+
+    def pruneWatchedRuns(self):
+        # Runs of rows that were deleted are stopped; a sort rebuilds the rows, so this waits until it is done
+        tokens = {self.fileListWidget.item(row).data(WATCH_ROLE) for row in range(self.fileListWidget.count())}
+        for token in list(self.watchProcesses):
+            if token not in tokens:
+                self.stopWatchedRun(token)
+
+    def toggleMetadataColumns(self):
+        self.metadataDelegate.enabled = not self.metadataDelegate.enabled
+        self.prefetchVisibleMetadata()
+        self.fileListWidget.viewport().update()
+
+    def prefetchVisibleMetadata(self):
+        if not self.metadataDelegate.enabled or not self.fileListWidget.count():
+            return
+        viewport = self.fileListWidget.viewport().rect()
+        firstRow = self.fileListWidget.indexAt(viewport.topLeft()).row()
+        lastRow = self.fileListWidget.indexAt(viewport.bottomLeft()).row()
+        firstRow = max(0, (firstRow if firstRow != -1 else 0) - METADATA_PREFETCH_ROWS)
+        lastRow = min(self.fileListWidget.count() - 1, (lastRow if lastRow != -1 else self.fileListWidget.count() - 1) + METADATA_PREFETCH_ROWS)
+        self.metadataCache.request([self.fileListWidget.item(row).text() for row in range(firstRow, lastRow + 1)])
+
+    def scheduleMetadataRepaint(self):
+        # Coalesce the repaints requested by many finished lookups into one, in the main thread
+        if not self.metadataRepaintPending:
+            self.metadataRepaintPending = True
+            QApplication.instance().postEvent(self, CustomEvent(self.repaintMetadata))
+
+    def repaintMetadata(self):
+        self.metadataRepaintPending = False
+        self.fileListWidget.viewport().update()
+
+    def sortFileList(self):
+        # Sorting rebuilds the rows, which running commands and searches still report back to
+        if self.activeBatch is not None or self.contentSearchCancelled is not None:
+            QMessageBox.warning(self, "Sort", "Wait for the running commands or content search to finish before sorting.")
+            return
+        choice, ok = QInputDialog.getItem(self, "Sort", "Sort the list by:", list(SORT_CHOICES), 0, False)
+        if not ok:
+            return
+        field, descending = SORT_CHOICES[choice]
+        paths = [self.fileListWidget.item(row).text() for row in range(self.fileListWidget.count())]
+
+        def computeOrder():
+            # Sort keys are computed once per row off the GUI thread; rows without metadata stay last
+            if field is None:
+                keys = paths
+            else:
+                keys = [getattr(metadata, field) if metadata else None
+                        for metadata in self.metadataCache.executor.map(self.metadataCache.fetch, paths)]
+            rows = [row for row in range(len(paths)) if keys[row] is not None]
+            rows.sort(key=keys.__getitem__, reverse=descending)
+            rows += [row for row in range(len(paths)) if keys[row] is None]
+            QApplication.instance().postEvent(self, CustomEvent(lambda: self.applyRowOrder(paths, rows)))
+
+        threading.Thread(target=computeOrder, daemon=True).start()
+
+    def applyRowOrder(self, paths, order):
+        # Skip a stale result if the list changed while the keys were being computed
+        if paths != [self.fileListWidget.item(row).text() for row in range(self.fileListWidget.count())]:
+            return
+
+        if self.activeBatch is not None or self.contentSearchCancelled is not None:
+            return  # Started while the keys were being computed
+
+        self.addEmptySideListItems()
+        hiddenRows = [self.fileListWidget.isRowHidden(row) for row in range(self.fileListWidget.count())]
+        carriedData = {}
+        for row in range(self.fileListWidget.count()):
+            item = self.fileListWidget.item(row)
+            if item.data(WATCH_ROLE) or item.data(FAILURE_ROLE) or item.data(DUPLICATE_ROLE):
+                carriedData[row] = {role: item.data(role) for role in ROW_DATA_ROLES}
+
+        # Each list is rebuilt in one call, like populateLists, rather than moving 100k items one by one
+        for listWidget in [self.leftListWidget, self.fileListWidget, self.rightListWidget]:
+            texts = paths if listWidget is self.fileListWidget else [listWidget.item(row).text() for row in range(listWidget.count())]
+            listWidget.setUpdatesEnabled(False)
+            listWidget.clear()
+            listWidget.addItems([texts[row] for row in order] + texts[len(order):])  # Side rows beyond the file list stay at the end
+            listWidget.setUpdatesEnabled(True)
+
+        # Watched, failed and duplicate rows take their data along, without a model signal per row
+        model = self.fileListWidget.model()
+        model.blockSignals(True)
+        for row, previousRow in enumerate(order):
+            for role, value in carriedData.get(previousRow, {}).items():
+                self.fileListWidget.item(row).setData(role, value)
+        model.blockSignals(False)
+        self.fileListWidget.viewport().update()
+
+        # Rebuilt rows come back visible, so hide the filtered-out files again at their new rows
+        for row, previousRow in enumerate(order):
+            if hiddenRows[previousRow]:
+                self.fileListWidget.setRowHidden(row, True)
+        self.reapplyContentFilter()
+        self.updatePlayListWidget()  # Only moves the ▶ of rows whose command moved
+
+    def findDuplicates(self):
+        paths = list(dict.fromkeys(self.fileListWidget.item(row).text() for row in range(self.fileListWidget.count())))
+        cancelled = threading.Event()
+
+        # Non-modal, so the list stays usable while the files are compared
+        self.duplicatesProgress = QProgressDialog("Looking for duplicates...", "Cancel", 0, max(1, len(paths)), self)
+        self.duplicatesProgress.setWindowTitle("Find Duplicates")
+        self.duplicatesProgress.setWindowModality(Qt.NonModal)
+        self.duplicatesProgress.canceled.connect(cancelled.set)
+        self.duplicatesProgress.show()
+
+        def reportProgress(stage, done, total):
+            def update():
+                if not cancelled.is_set():
+                    self.duplicatesProgress.setLabelText(f"{stage}... ({done} of {total})")
+                    self.duplicatesProgress.setMaximum(max(1, total))
+                    self.duplicatesProgress.setValue(done)
+            QApplication.instance().postEvent(self, CustomEvent(update))
+
+        def search():
+            try:
+                # Checked here rather than on the GUI thread, since stat can be slow on network mounts
+                files = [path for path in paths if os.path.isfile(path)]
+                groups = findDuplicateGroups(files, reportProgress, cancelled.is_set)
+            except Exception as e:
+                groups = []
+                self.showErrorDialog(f"Could not look for duplicates: {e}")
+            if not cancelled.is_set():
+                QApplication.instance().postEvent(self, CustomEvent(lambda: self.showDuplicateGroups(groups)))
+
+        threading.Thread(target=search, daemon=True).start()
+
+    def showDuplicateGroups(self, groups):
+        self.duplicatesProgress.reset()
+        self.duplicatesProgress.hide()
+
+        # Color each group and select every copy but the first, ready to be deleted from the list
+        self.fileListWidget.clearSelection()
+        groupOfPath = {path: index for index, group in enumerate(groups) for path in group}
+        keptGroups = set()
+        for row in range(self.fileListWidget.count()):
+            item = self.fileListWidget.item(row)
+            index = groupOfPath.get(item.text())
+            item.setData(DUPLICATE_ROLE, None if index is None else DUPLICATE_COLORS[index % len(DUPLICATE_COLORS)])
+            self.updateRowBackground(item)
+            if index is None:
+                continue
+            if index in keptGroups:
+                item.setSelected(True)
+            else:
+                keptGroups.add(index)
+
+        if groups:
+            QMessageBox.information(self, "Find Duplicates", f"Found {len(groups)} group(s) of duplicate files. Every copy but the first of each group is selected.")
+        else:
+            QMessageBox.information(self, "Find Duplicates", "No duplicate files were found.")
+
+    def searchFileContents(self):
+        text, ok = QInputDialog.getText(self, "Search Contents", "Show files containing (text, or /regex/):")
+        if not ok:
+            return
+        self.cancelContentSearch()
+        if not text:
+            self.clearContentFilter()
+            return
+        try:
+            pattern = compileSearchPattern(text)
+        except re.error as e:
+            QMessageBox.warning(self, "Invalid Pattern", f"The regular expression is not valid: {e}")
+            return
+
+        # Start with every row hidden and reveal rows as their files match
+        items = [self.fileListWidget.item(row) for row in range(self.fileListWidget.count())]
+        paths = [item.text() for item in items]
+        for row in range(len(items)):
+            self.setRowHidden(row, True)
+        self.contentFilterActive = True
+        self.contentMatches = 0
+        self.contentSearchText = text
+        cancelled = threading.Event()
+        self.contentSearchCancelled = cancelled
+        self.updateContentSearchTitle(searching=True)
+
+        def search():
+            # Only a bounded number of files is queued at once, however long the list is
+            slots = threading.BoundedSemaphore(SEARCH_WORKERS * 4)
+            with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+                for item, path in zip(items, paths):
+                    if cancelled.is_set():
+                        break
+                    if path.startswith(':}') or not os.path.isfile(path):
+                        continue
+                    slots.acquire()
+                    future = executor.submit(fileContainsPattern, path, pattern, cancelled.is_set)
+
+                    def onSearched(future, item=item):
+                        slots.release()
+                        if future.result() and not cancelled.is_set():
+                            QApplication.instance().postEvent(self, CustomEvent(lambda: self.showContentMatch(item, cancelled)))
+                    future.add_done_callback(onSearched)
+            QApplication.instance().postEvent(self, CustomEvent(lambda: self.finishContentSearch(cancelled)))
+
+        threading.Thread(target=search, daemon=True).start()
+
+    def showContentMatch(self, item, cancelled):
+        # A match can still be queued after its search was cancelled or replaced by a new one
+        if cancelled.is_set():
+            return
+        row = self.fileListWidget.row(item)
+        if row != -1 and self.contentFilterActive:
+            self.setRowHidden(row, False)
+            self.contentMatches += 1
+            self.updateContentSearchTitle(searching=self.contentSearchCancelled is not None)
+
+    def finishContentSearch(self, cancelled):
+        if self.contentSearchCancelled is cancelled:
+            self.contentSearchCancelled = None
+            if self.contentFilterActive:
+                self.updateContentSearchTitle(searching=False)
+
+    def cancelContentSearch(self):
+        if self.contentSearchCancelled is not None:
+            self.contentSearchCancelled.set()
+            self.contentSearchCancelled = None
+            if self.contentFilterActive:
+                self.updateContentSearchTitle(searching=False)
+            return True
+        return False
+
+    def clearContentFilter(self):
+        self.contentFilterActive = False
+        for row in range(self.fileListWidget.count()):
+            self.setRowHidden(row, False)
+        self.setWindowTitle('File Paths Placeholder')
+
+    def updateContentSearchTitle(self, searching):
+        status = "Searching" if searching else "Found"
+        self.setWindowTitle(f'File Paths Placeholder - {status}: {self.contentMatches} file(s) containing "{self.contentSearchText}"')
+
+    def reapplyContentFilter(self):
+        # Rebuilt rows come back visible, so copy the hidden state over from the file list again
+        if self.contentFilterActive:
+            for row in range(self.fileListWidget.count()):
+                self.setRowHidden(row, self.fileListWidget.isRowHidden(row))
+
+    def setRowHidden(self, row, hidden):
+        for listWidget in [self.playListWidget, self.leftListWidget, self.fileListWidget, self.rightListWidget]:
+            if row < listWidget.count():
+                listWidget.setRowHidden(row, hidden)
+        self.commandPreviewView.setRowHidden(row, hidden)
+
+    def constructCommandForRow(self, row):
+        return self.constructCommandsForRows([row])[0]
+
+    def constructCommandsForRows(self, rows):
+        commands = []
+        for row in rows:
+            leftItemText = self.leftListWidget.item(row).text() if self.leftListWidget.item(row) else ""
+            filePath = self.fileListWidget.item(row).text() if self.fileListWidget.item(row) else ""
+            rightItemText = self.rightListWidget.item(row).text() if self.rightListWidget.item(row) else ""
+
+            # Special handling for ':}' in filePath
+            if filePath.startswith(':}'):
+                filePath = filePath[2:].lstrip()
+
+            # Splitting rightItemText at ':}' if present
+            rightItemText, _, comment = rightItemText.partition(':}')
+
+            # Rows marked @template place the path themselves with placeholders such as {path} or {stem}
+            if TEMPLATE_DIRECTIVE_PATTERN.search(comment):
+                leftTemplate = compileTemplate(leftItemText)
+                rightTemplate = compileTemplate(rightItemText)
+                if leftTemplate[0] or rightTemplate[0]:
+                    parts = pathParts(filePath)
+                    commands.append(f'{expandTemplate(leftTemplate, parts)} {expandTemplate(rightTemplate, parts)}')
+                    continue
+                leftItemText, rightItemText = leftTemplate[1], rightTemplate[1]  # Only escaped placeholders
+
+            # Constructing the command based on the platform
+            commands.append(f'{leftItemText} {quoteArgument(filePath)} {rightItemText}')
+
+        return commands
+
+    def refreshCommandPreview(self):
+        self.commandPreviewModel.refresh()
+        if self.contentFilterActive:
+            for row in range(self.fileListWidget.count()):
+                self.commandPreviewView.setRowHidden(row, self.fileListWidget.isRowHidden(row))
+    
     def loadFontSize(self):
         default_font_size = 12
         try:
@@ -600,6 +1933,42 @@ class FilePathsPlaceholder(QWidget):
             print(f"Error loading font size: {e}")
             return default_font_size
 
+    def loadRunAllWorkers(self):
+        default_workers = 1
+        try:
+            if os.path.exists(self.run_all_workers_file):
+                with open(self.run_all_workers_file, 'r', newline='', encoding='utf-8') as file:
+                    reader = csv.reader(file)
+                    for row in reader:
+                        return max(1, int(row[0])) if row else default_workers
+            return default_workers
+        except Exception as e:
+            print(f"Error loading parallel jobs: {e}")
+            return default_workers
+
+    def saveRunAllWorkers(self):
+        with open(self.run_all_workers_file, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow([self.runAllWorkers])
+
+    def loadResourceLimits(self):
+        self.globalResourceLimitsText = ""
+        try:
+            if os.path.exists(self.resource_limits_file):
+                with open(self.resource_limits_file, 'r', newline='', encoding='utf-8') as file:
+                    reader = csv.reader(file)
+                    for row in reader:
+                        self.globalResourceLimitsText = row[0] if row else ""
+                        break
+        except Exception as e:
+            print(f"Error loading resource limits: {e}")
+        return parseResourceLimits(self.globalResourceLimitsText)
+
+    def saveResourceLimits(self):
+        with open(self.resource_limits_file, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow([self.globalResourceLimitsText])
+
     def saveFontSize(self):
         with open(self.font_size_file, 'w', newline='', encoding='utf-8') as file:
             writer = csv.writer(file)
@@ -608,6 +1977,8 @@ class FilePathsPlaceholder(QWidget):
     def closeEvent(self, event):
         self.saveFontSize()  # Save the font size before closing
         self.executor.shutdown(wait=False)
+        self.launcher.shutdown()
+        self.metadataCache.shutdown()
         super().closeEvent(event)
 
     def clearList(self):
@@ -621,6 +1992,8 @@ class FilePathsPlaceholder(QWidget):
         return parsed_url.scheme and parsed_url.netloc or os.path.exists(text)
 
     def refreshList(self):
+        self.metadataCache.invalidate()  # Sizes and times may have changed since they were fetched
+        self.fileListWidget.viewport().update()
         indexesToRemove = []
         for index in range(self.fileListWidget.count()):
             item_text = self.fileListWidget.item(index).text()
@@ -642,52 +2015,180 @@ class FilePathsPlaceholder(QWidget):
         if indexesToRemove:
             self.saveLastUsedListPath()
 
+    def currentRows(self):
+        rows = []
+        maxItems = max(self.fileListWidget.count(), self.leftListWidget.count(), self.rightListWidget.count())
+        for i in range(maxItems):
+            leftItem = self.leftListWidget.item(i).text() if i < self.leftListWidget.count() else ""
+            rightItem = self.rightListWidget.item(i).text() if i < self.rightListWidget.count() else ""
+            filePath = self.fileListWidget.item(i).text() if i < self.fileListWidget.count() else ""
+            rows.append((leftItem, filePath, rightItem))
+        return rows
+
     def saveLastUsedListPath(self):
+        # Saves the list of the active tab
         with open(self.current_list_file, 'w', newline='', encoding='utf-8') as file:
             writer = csv.writer(file)
             writer.writerow(["LeftItem", "FilePath", "RightItem"])  # Write headers
+            writer.writerows(self.currentRows())
 
-            maxItems = max(self.fileListWidget.count(), self.leftListWidget.count(), self.rightListWidget.count())
-            for i in range(maxItems):
-                leftItem = self.leftListWidget.item(i).text() if i < self.leftListWidget.count() else ""
-                rightItem = self.rightListWidget.item(i).text() if i < self.rightListWidget.count() else ""
-                filePath = self.fileListWidget.item(i).text() if i < self.fileListWidget.count() else ""
-                writer.writerow([leftItem, filePath, rightItem])
-    
     def loadLastUsedList(self):
-        if os.path.exists(self.current_list_file):
-            with open(self.current_list_file, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                next(reader, None)  # Skip headers
+        self.populateLists(self.loadWorkspaceRows(self.activeWorkspace))
 
-                self.playListWidget.clear()
-                self.leftListWidget.clear()
-                self.fileListWidget.clear()
-                self.rightListWidget.clear()
+    def loadWorkspaceRows(self, workspace):
+        # Accept :} prefixed items or valid file paths/URLs
+        return [row for row in workspace.readRows() if row[1].startswith(':}') or self.isValidPathOrUrl(row[1])]
 
-                for leftItem, filePath, rightItem in reader:
-                    self.leftListWidget.addItem(QListWidgetItem(leftItem))
-                    self.rightListWidget.addItem(QListWidgetItem(rightItem))
-                    
-                    # Accept :} prefixed items or valid file paths/URLs
-                    if filePath.startswith(':}') or self.isValidPathOrUrl(filePath):
-                        self.fileListWidget.addItem(QListWidgetItem(filePath))
-                    else:
-                        # Optionally handle missing file paths, e.g., add a placeholder or log
-                        pass
+    def populateLists(self, rows):
+        self.playListWidget.clear()
+        self.leftListWidget.clear()
+        self.fileListWidget.clear()
+        self.rightListWidget.clear()
 
-                self.updatePlayListWidget()
-    
-    def executeFilePath(self, item):
-        filepath = item.text()
+        # Adding all rows in one call per list keeps switching between large lists fast
+        self.leftListWidget.addItems([leftItem for leftItem, _, _ in rows])
+        self.fileListWidget.addItems([filePath for _, filePath, _ in rows])
+        self.rightListWidget.addItems([rightItem for _, _, rightItem in rows])
+        self.updatePlayListWidget()
+
+    def workspacePath(self, name):
+        if name == DEFAULT_WORKSPACE_NAME:
+            return os.path.join(self.filepp_folder, CURRENT_LIST_FILENAME)
+        return os.path.join(self.workspace_folder, f"{name}.csv")
+
+    def loadWorkspaces(self):
+        names, activeName = [], DEFAULT_WORKSPACE_NAME
         try:
-            if platform.system() == 'Windows':
-                os.startfile(filepath)  # For Windows
-            else:
-                opener = 'open' if platform.system() == 'Darwin' else 'xdg-open'
-                subprocess.call([opener, filepath])  # For macOS and Linux
+            if os.path.exists(self.workspaces_file):
+                with open(self.workspaces_file, 'r', newline='', encoding='utf-8') as file:
+                    reader = csv.reader(file)
+                    next(reader, None)  # Skip headers
+                    for row in reader:
+                        if row and row[0] not in names:
+                            names.append(row[0])
+                            if len(row) > 1 and row[1] == "active":
+                                activeName = row[0]
+        except Exception as e:
+            print(f"Error loading list tabs: {e}")
+        if DEFAULT_WORKSPACE_NAME not in names:
+            names.insert(0, DEFAULT_WORKSPACE_NAME)
+        if activeName not in names:
+            activeName = DEFAULT_WORKSPACE_NAME
+
+        self.memoryBudget = self.loadMemoryBudget()
+        self.workspaces = [Workspace(name, self.workspacePath(name)) for name in names]
+        self.recentWorkspaces = collections.OrderedDict()  # Loaded inactive tabs, least recently used first
+        self.activeWorkspace = self.workspaces[names.index(activeName)]
+        self.current_list_file = self.activeWorkspace.path
+
+        self.workspaceTabBar.blockSignals(True)
+        for workspace in self.workspaces:
+            self.workspaceTabBar.addTab(workspace.name)
+        self.workspaceTabBar.setCurrentIndex(names.index(activeName))
+        self.workspaceTabBar.blockSignals(False)
+
+    def saveWorkspaces(self):
+        # Inactive tabs still held in memory are written back; the active one is saved by saveLastUsedListPath
+        for workspace in self.recentWorkspaces.values():
+            workspace.save()
+        with open(self.workspaces_file, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(["Name", "State"])  # Write headers
+            for workspace in self.workspaces:
+                writer.writerow([workspace.name, "active" if workspace is self.activeWorkspace else ""])
+
+    def loadMemoryBudget(self):
+        # Megabytes of rows that inactive tabs may keep in memory
+        try:
+            if os.path.exists(self.memory_budget_file):
+                with open(self.memory_budget_file, 'r', newline='', encoding='utf-8') as file:
+                    reader = csv.reader(file)
+                    for row in reader:
+                        return float(row[0]) * 1024 * 1024 if row else DEFAULT_MEMORY_BUDGET_MB * 1024 * 1024
+            return DEFAULT_MEMORY_BUDGET_MB * 1024 * 1024
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not open the file: {e}")
+            print(f"Error loading memory budget: {e}")
+            return DEFAULT_MEMORY_BUDGET_MB * 1024 * 1024
+
+    def switchWorkspace(self, index):
+        if index < 0 or self.workspaces[index] is self.activeWorkspace:
+            return
+
+        # Keep the rows of the tab being left in memory, so switching back to it is instant
+        previous = self.activeWorkspace
+        previous.store(self.currentRows())
+        self.recentWorkspaces[previous.name] = previous
+        self.cancelContentSearch()
+        self.clearContentFilter()
+
+        # A tab's rows are read from disk only the first time it is opened, or after being evicted
+        workspace = self.workspaces[index]
+        rows = workspace.rows if workspace.rows is not None else self.loadWorkspaceRows(workspace)
+        self.recentWorkspaces.pop(workspace.name, None)
+        workspace.rows, workspace.size = None, 0
+        self.activeWorkspace = workspace
+        self.current_list_file = workspace.path
+        self.populateLists(rows)
+        self.evictWorkspaces()
+
+    def evictWorkspaces(self):
+        # Write the least recently used inactive tabs to disk until the rest fit in the budget
+        while self.recentWorkspaces and sum(workspace.size for workspace in self.recentWorkspaces.values()) > self.memoryBudget:
+            _, workspace = self.recentWorkspaces.popitem(last=False)
+            workspace.evict()
+
+    def newWorkspace(self):
+        name, ok = QInputDialog.getText(self, 'New List', 'Name of the new list:')
+        name = name.strip()
+        if not ok or not name:
+            return
+        if any(workspace.name == name for workspace in self.workspaces):
+            QMessageBox.warning(self, "Invalid Name", f"There is already a list named \"{name}\".")
+            return
+        if os.sep in name or (os.altsep and os.altsep in name) or name.startswith('.'):
+            QMessageBox.warning(self, "Invalid Name", "A list name cannot contain path separators or start with a dot.")
+            return
+
+        # A list closed earlier under the same name is reopened with its saved rows
+        self.workspaces.append(Workspace(name, self.workspacePath(name)))
+        self.workspaceTabBar.addTab(name)
+        self.workspaceTabBar.setCurrentIndex(len(self.workspaces) - 1)
+
+    def closeWorkspace(self, index):
+        if len(self.workspaces) < 2:
+            return
+        workspace = self.workspaces[index]
+        if workspace is self.activeWorkspace:
+            self.workspaceTabBar.setCurrentIndex(index - 1 if index else index + 1)
+
+        # The list file is kept on disk, so the tab can be reopened by name later
+        if self.recentWorkspaces.pop(workspace.name, None) is not None:
+            workspace.evict()
+        del self.workspaces[index]
+        self.workspaceTabBar.removeTab(index)
+
+    def executeFilePath(self, item):
+        # The first click of a double-click already collapses the selection, so this opens one item;
+        # Ctrl+O opens a multi-row selection
+        self.openFilePaths([item.text()])
+
+    def openFilePaths(self, paths):
+        if paths:
+            self.launcher.launch(paths)
+
+    def reportOpenFailures(self, failures):
+        if not failures:
+            return
+
+        def showReport():
+            # Non-modal, so the event loop keeps running while the report is open
+            self.openFailureBox = QMessageBox(QMessageBox.Warning, "Error", f"Could not open {len(failures)} item(s).", QMessageBox.Ok, self)
+            self.openFailureBox.setDetailedText("\n".join(failures))
+            self.openFailureBox.setModal(False)
+            self.openFailureBox.show()
+
+        # Show the report in the main thread
+        QApplication.instance().postEvent(self, CustomEvent(showReport))
 
     def cleanupAfterTermination(self):
         self.enableInteraction()         # Re-enable interaction
@@ -710,8 +2211,12 @@ class FilePathsPlaceholder(QWidget):
         self.playListWidget.clearSelection()
 
     def terminateRunningProcess(self):
-        if self.runningProcess:
-            self.runningProcess.terminate()
+        if getattr(self, 'runningProcess', None) or self.runningProcesses:
+            # Every parallel command or pipeline stage, with everything it started; the grace period
+            # before SIGKILL is waited out in the background
+            for process in list(self.runningProcesses):
+                threading.Thread(target=killProcessTree, args=(process,), daemon=True).start()
+            self.runningProcesses.clear()
             self.runningProcess = None
             self.enableInteraction()
             self.stopAllCommands = True  # Also stop all commands if one is terminated
@@ -719,13 +2224,18 @@ class FilePathsPlaceholder(QWidget):
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Escape:
             # Check and terminate the running process
-            if hasattr(self, 'runningProcess') and self.runningProcess is not None:
+            if self.runningProcesses or getattr(self, 'runningProcess', None) is not None:
                 self.terminateRunningProcess()
+            self.stopWatchedRuns()
 
-            # Check and stop all commands in the thread
-            if hasattr(self, 'commandThread') and self.commandThread.is_alive():
+            # Check and stop all commands in the thread, including queued commands of a batch
+            if hasattr(self, 'commandThread') and self.commandThread.is_alive() or self.activeBatch is not None:
                 self.stopAllCommands = True
 
+            # Cancel a running content search, or drop its filter once it has finished
+            if not self.cancelContentSearch() and self.contentFilterActive:
+                self.clearContentFilter()
+
             # Clear selections in all list widgets
             if (not hasattr(self, 'runningProcess') or self.runningProcess is None) and \
             (not hasattr(self, 'commandThread') or not self.commandThread.is_alive()) or \
@@ -736,8 +2246,14 @@ class FilePathsPlaceholder(QWidget):
 
     def exportList(self):
         try:
-            file_path, _ = QFileDialog.getSaveFileName(self, "Save File", "", "CSV Files (*.csv)")
-            if file_path:
+            file_path, selected_filter = QFileDialog.getSaveFileName(self, "Save File", "", ";;".join([CSV_FILTER, MAKEFILE_FILTER, NINJA_FILTER]))
+            if file_path and selected_filter == MAKEFILE_FILTER:
+                self.exportMakefile(file_path)
+                QMessageBox.information(self, "Export Successful", "The list was exported as a Makefile. Run it with make -j.")
+            elif file_path and selected_filter == NINJA_FILTER:
+                self.exportNinjaFile(file_path)
+                QMessageBox.information(self, "Export Successful", "The list was exported as a Ninja file. Run it with ninja -f.")
+            elif file_path:
                 with open(file_path, 'w', newline='', encoding='utf-8') as file:
                     writer = csv.writer(file)
                     writer.writerow(["LeftItem", "FilePath", "RightItem"])  # CSV headers
@@ -754,6 +2270,63 @@ class FilePathsPlaceholder(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An error occurred: {e}")
             
+    def collectBuildRules(self):
+        # One rule per runnable row: the command exactly as Run All would build it, the local file
+        # as its input (if there is one) and a stamp named after the command as its output
+        rules = []
+        stamps = set()
+        rows = [row for row in range(min(self.leftListWidget.count(), self.fileListWidget.count()))
+                if self.leftListWidget.item(row).text() and self.fileListWidget.item(row).text().strip()]
+        for row, command in zip(rows, self.constructCommandsForRows(rows)):
+            filePath = self.fileListWidget.item(row).text()
+            stamp = f"{STAMP_DIRECTORY}/{hashlib.sha1(command.encode('utf-8')).hexdigest()[:16]}.stamp"
+            if stamp in stamps:
+                continue  # The same command on the same file only needs to run once
+            stamps.add(stamp)
+            inputPath = filePath if not filePath.startswith(':}') and os.path.exists(filePath) else None
+            rules.append((stamp, inputPath, command))
+        return rules
+
+    def exportMakefile(self, file_path):
+        def escapePath(path):
+            # Make splits prerequisites on whitespace, treats '$', '#', ':' and wildcards specially, and would
+            # read a rule line with '=' as a variable assignment; a ';' or line break cannot be escaped at all
+            if any(char in path for char in ';\n\r'):
+                return None
+            path = path.replace('$', '$$')
+            for char in ' #:*?[]':
+                path = path.replace(char, '\\' + char)
+            return path.replace('=', '$(EQUALS)')
+
+        rules = self.collectBuildRules()
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write("# Generated by File Paths Placeholder\n")
+            file.write("EQUALS := =\n")
+            file.write(".PHONY: all\n")
+            file.write("all:" + "".join(f" \\\n\t{stamp}" for stamp, _, _ in rules) + "\n")
+            for stamp, inputPath, command in rules:
+                prerequisite = escapePath(inputPath) if inputPath else None
+                if inputPath and prerequisite is None:
+                    print(f"Make cannot name this file as an input, so its rule will not re-run when it changes: {inputPath}")
+                file.write(f"\n{stamp}:{' ' + prerequisite if prerequisite else ''}\n")
+                file.write(f"\t@mkdir -p {STAMP_DIRECTORY}\n")
+                file.write(f"\t{command.replace('$', '$$')}\n")
+                file.write("\t@touch $@\n")
+
+    def exportNinjaFile(self, file_path):
+        def escapePath(path):
+            return path.replace('$', '$$').replace(' ', '$ ').replace(':', '$:')
+
+        rules = self.collectBuildRules()
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write("# Generated by File Paths Placeholder\n")
+            file.write("rule fpp\n")
+            file.write("  command = ( $cmd ) && touch $out\n")
+            file.write("  description = $cmd\n")
+            for stamp, inputPath, command in rules:
+                file.write(f"\nbuild {stamp}: fpp{' ' + escapePath(inputPath) if inputPath else ''}\n")
+                file.write(f"  cmd = {command.replace('$', '$$')}\n")
+
     def importList(self, file_path=None, auto_load=False):
         if not file_path and not auto_load:
             file_path, _ = QFileDialog.getOpenFileName(self, "Open File", "", "CSV Files (*.csv)")
@@ -912,6 +2485,45 @@ class RightListWidget(QListWidget):
         self.verticalScrollBar().valueChanged.connect(syncScroll)
 
 
+class CommandPreviewModel(QAbstractListModel):
+    # Commands are expanded only when the view asks for a row, i.e. for the rows on screen
+    def __init__(self, placeholder):
+        super(CommandPreviewModel, self).__init__(placeholder)
+        self.placeholder = placeholder
+        self.commands = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.placeholder.fileListWidget.count()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        row = index.row()
+        if row not in self.commands:
+            leftItem = self.placeholder.leftListWidget.item(row)
+            self.commands[row] = self.placeholder.constructCommandForRow(row) if leftItem and leftItem.text() else ""
+        return self.commands[row]
+
+    def refresh(self):
+        self.beginResetModel()
+        self.commands.clear()
+        self.endResetModel()
+
+
+class CommandPreviewView(QListView):
+    def __init__(self, parent=None):
+        super(CommandPreviewView, self).__init__(parent)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setUniformItemSizes(True)
+
+    def connectScroll(self, otherWidgets):
+        def syncScroll(value):
+            for widget in otherWidgets:
+                if widget.verticalScrollBar() is not self.verticalScrollBar():
+                    widget.verticalScrollBar().setValue(value)
+        self.verticalScrollBar().valueChanged.connect(syncScroll)
+
+
 class CustomEvent(QEvent):
     def __init__(self, fn):
         super().__init__(QEvent.User)